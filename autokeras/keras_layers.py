@@ -46,6 +46,57 @@ class MultiCategoryEncoding(preprocessing.PreprocessingLayer):
                 self.encoding_layers.append(preprocessing.StringLookup())
             elif encoding == ONE_HOT:
                 self.encoding_layers.append(None)
+        self._numerical_indices = [
+            index
+            for index, layer in enumerate(self.encoding_layers)
+            if layer is None
+        ]
+        self._categorical_indices = [
+            index
+            for index, layer in enumerate(self.encoding_layers)
+            if layer is not None
+        ]
+        self._output_permutation = self._compute_output_permutation()
+        self._shared_vocabulary = None
+        self._shared_vocabulary_ids = None
+        self._shared_oov_id = None
+        self._shared_lookup = None
+        self._column_prefixes = None
+        self._encode_fn = self._make_encode_fn()
+
+    def _make_encode_fn(self):
+        # Since the encoding is immutable, the fast paths can be specialized
+        # here instead of being branched on in every call. Tracing the encoding
+        # graph once also avoids dispatching the ops eagerly on every call. XLA
+        # compilation is not used since the string ops have no XLA kernels.
+        if not self._categorical_indices:
+            # All the columns are numerical. The input may already be numbers,
+            # in which case parsing strings would be pure overhead, so the
+            # signature is left open to specialize on the input dtype.
+            return tf.function(
+                self._encode_numerical, experimental_relax_shapes=True
+            )
+        if len(self.encoding) == 1:
+            encode = self._encode_single
+        else:
+            encode = self._encode_multi
+        return tf.function(
+            encode,
+            input_signature=[tf.TensorSpec([None, len(self.encoding)], tf.string)],
+        )
+
+    def _compute_output_permutation(self):
+        # The numerical columns are encoded together as a single block, so the
+        # outputs come out grouped as numerical columns followed by categorical
+        # columns. This permutation restores the original column order. It is
+        # None when the grouped order is already the original order.
+        grouped_indices = self._numerical_indices + self._categorical_indices
+        permutation = [
+            grouped_indices.index(index) for index in range(len(grouped_indices))
+        ]
+        if permutation == list(range(len(grouped_indices))):
+            return None
+        return permutation
 
     def build(self, input_shape):
         for encoding_layer in self.encoding_layers:
@@ -53,33 +104,149 @@ class MultiCategoryEncoding(preprocessing.PreprocessingLayer):
                 encoding_layer.build(tf.TensorShape([1]))
 
     def call(self, inputs):
-        input_nodes = nest.flatten(inputs)[0]
-        split_inputs = tf.split(input_nodes, [1] * len(self.encoding), axis=-1)
+        return self._encode_fn(nest.flatten(inputs)[0])
+
+    def _encode_numerical(self, input_nodes):
+        if input_nodes.dtype == tf.string:
+            numbers = tf.strings.to_number(input_nodes, tf.float32)
+        else:
+            numbers = tf.cast(input_nodes, tf.float32)
+        return tf.where(tf.math.is_nan(numbers), 0.0, numbers)
+
+    def _encode_single(self, input_nodes):
+        # Only reached for a single categorical column. A single numerical
+        # column is handled by _encode_numerical.
+        return self._encode_categorical(input_nodes)
+
+    def _encode_multi(self, input_nodes):
         output_nodes = []
-        for input_node, encoding_layer in zip(split_inputs, self.encoding_layers):
-            if encoding_layer is None:
-                number = tf.strings.to_number(input_node, tf.float32)
-                # Replace NaN with 0.
-                imputed = tf.where(
-                    tf.math.is_nan(number), tf.zeros_like(number), number
-                )
-                output_nodes.append(imputed)
-            else:
-                output_nodes.append(tf.cast(encoding_layer(input_node), tf.float32))
+        if self._numerical_indices:
+            numbers = tf.strings.to_number(
+                tf.gather(input_nodes, self._numerical_indices, axis=1), tf.float32
+            )
+            # Replace NaN with 0. The scalar zero broadcasts, avoiding a full
+            # zeros tensor per batch.
+            imputed = tf.where(tf.math.is_nan(numbers), 0.0, numbers)
+            output_nodes.append(imputed)
+        output_nodes.append(
+            self._encode_categorical(
+                tf.gather(input_nodes, self._categorical_indices, axis=1)
+            )
+        )
+        if len(output_nodes) == 1:
+            outputs = output_nodes[0]
+        else:
+            outputs = tf.concat(output_nodes, axis=-1)
+        if self._output_permutation is None:
+            return outputs
+        return tf.gather(outputs, self._output_permutation, axis=1)
+
+    def _encode_categorical(self, cat_inputs):
+        if self._shared_lookup is not None:
+            # One lookup over all the categorical columns at once. The keys
+            # are the values prefixed with the column position, matching the
+            # vocabulary built in _build_shared_lookup.
+            prefixes = tf.tile(
+                tf.expand_dims(self._column_prefixes, 0),
+                [tf.shape(cat_inputs)[0], 1],
+            )
+            keys = tf.strings.join([prefixes, cat_inputs])
+            return tf.cast(self._shared_lookup.lookup(keys), tf.float32)
+        # The layer has not been adapted. Fall back to the per column lookups.
+        output_nodes = [
+            tf.cast(
+                self.encoding_layers[index](cat_inputs[:, position : position + 1]),
+                tf.float32,
+            )
+            for position, index in enumerate(self._categorical_indices)
+        ]
         if len(output_nodes) == 1:
             return output_nodes[0]
-        return tf.keras.layers.Concatenate()(output_nodes)
+        return tf.concat(output_nodes, axis=-1)
 
     def adapt(self, data):
-        for index, encoding_layer in enumerate(self.encoding_layers):
-            if encoding_layer is None:
+        if not self._categorical_indices:
+            return
+        # Project all the categorical columns in a single pass and cache the
+        # result, so the dataset is not read once per column.
+        projected = data.map(
+            lambda x: tf.gather(x, self._categorical_indices, axis=1),
+            num_parallel_calls=tf.data.experimental.AUTOTUNE,
+        ).cache()
+        for position, index in enumerate(self._categorical_indices):
+            self.encoding_layers[index].adapt(
+                projected.map(lambda x: x[:, position : position + 1])
+            )
+        self._build_shared_lookup()
+
+    def _build_shared_lookup(self):
+        # Merge the adapted per column vocabularies into a single one keyed by
+        # (column position, value), so call dispatches one lookup kernel for
+        # all the categorical columns instead of one per column. Every key is
+        # recorded with the id the column's own StringLookup assigns to it,
+        # and unknown keys fall back to its out-of-vocabulary id, so the
+        # shared path and the per column path encode identically. This is
+        # required because the tuner rebuilds the layer from scratch and only
+        # restores the lookup tables from the checkpoint, leaving the rebuilt
+        # layer on the per column path.
+        vocabulary = []
+        vocabulary_ids = []
+        for position, index in enumerate(self._categorical_indices):
+            layer = self.encoding_layers[index]
+            tokens = [tf.compat.as_text(token) for token in layer.get_vocabulary()]
+            if not tokens:
                 continue
-            data_column = data.map(lambda x: tf.slice(x, [0, index], [-1, 1]))
-            encoding_layer.adapt(data_column)
+            token_ids = layer(tf.constant([[token] for token in tokens]))
+            vocabulary.extend("{}:{}".format(position, token) for token in tokens)
+            vocabulary_ids.extend(
+                int(token_id) for token_id in token_ids.numpy().ravel()
+            )
+        oov_layer = self.encoding_layers[self._categorical_indices[0]]
+        self._shared_oov_id = int(oov_layer(tf.constant([[oov_layer.oov_token]])))
+        self._shared_vocabulary = vocabulary
+        self._shared_vocabulary_ids = vocabulary_ids
+        self._init_shared_lookup()
+
+    def _init_shared_lookup(self):
+        self._column_prefixes = tf.constant(
+            [
+                "{}:".format(position)
+                for position in range(len(self._categorical_indices))
+            ]
+        )
+        # The vocabulary is immutable once built, so a StaticHashTable avoids
+        # the per call Keras layer bookkeeping of StringLookup. The table
+        # carries the exact ids recorded from the per column lookups.
+        self._shared_lookup = tf.lookup.StaticHashTable(
+            tf.lookup.KeyValueTensorInitializer(
+                tf.constant(self._shared_vocabulary, dtype=tf.string),
+                tf.constant(self._shared_vocabulary_ids, dtype=tf.int64),
+            ),
+            default_value=tf.constant(self._shared_oov_id, dtype=tf.int64),
+        )
+        # The shared lookup replaces the per column lookups in the traced
+        # graph, so the encoding function needs to be traced again.
+        self._encode_fn = self._make_encode_fn()
+
+    @classmethod
+    def from_config(cls, config):
+        shared_vocabulary = config.pop("shared_vocabulary", None)
+        shared_vocabulary_ids = config.pop("shared_vocabulary_ids", None)
+        shared_oov_id = config.pop("shared_oov_id", None)
+        instance = cls(**config)
+        if shared_vocabulary is not None:
+            instance._shared_vocabulary = shared_vocabulary
+            instance._shared_vocabulary_ids = shared_vocabulary_ids
+            instance._shared_oov_id = shared_oov_id
+            instance._init_shared_lookup()
+        return instance
 
     def get_config(self):
         config = {
             "encoding": self.encoding,
+            "shared_vocabulary": self._shared_vocabulary,
+            "shared_vocabulary_ids": self._shared_vocabulary_ids,
+            "shared_oov_id": self._shared_oov_id,
         }
         base_config = super().get_config()
         return dict(list(base_config.items()) + list(config.items()))
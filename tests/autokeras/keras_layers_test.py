@@ -53,6 +53,26 @@ def test_model_save_load_output_same(tmp_path):
     assert np.array_equal(model.predict(x_train), model2.predict(x_train))
 
 
+def test_rebuilt_layer_with_restored_weights_encodes_identically(tmp_path):
+    x_train = np.array([["a", "ab", 2.1], ["b", "bc", 1.0], ["a", "bc", "nan"]])
+    layer = layer_module.MultiCategoryEncoding(
+        encoding=[layer_module.INT, layer_module.INT, layer_module.NONE]
+    )
+    layer.adapt(tf.data.Dataset.from_tensor_slices(x_train).batch(32))
+
+    # The tuner rebuilds the layer from scratch and only restores the lookup
+    # tables from the checkpoint, so the rebuilt layer encodes through the per
+    # column lookups instead of the shared table.
+    rebuilt = layer_module.MultiCategoryEncoding(
+        encoding=[layer_module.INT, layer_module.INT, layer_module.NONE]
+    )
+    checkpoint_path = os.path.join(tmp_path, "checkpoint")
+    tf.train.Checkpoint(layer=layer).write(checkpoint_path)
+    tf.train.Checkpoint(layer=rebuilt).restore(checkpoint_path)
+
+    assert np.array_equal(layer(x_train), rebuilt(x_train))
+
+
 def test_init_multi_one_hot_encode():
     layer_module.MultiCategoryEncoding(
         encoding=[layer_module.ONE_HOT, layer_module.INT, layer_module.NONE]
@@ -60,6 +80,20 @@ def test_init_multi_one_hot_encode():
     # TODO: add more content when it is implemented
 
 
+def test_multi_cat_encode_numerical_columns_only():
+    layer = layer_module.MultiCategoryEncoding(
+        encoding=[layer_module.NONE, layer_module.NONE]
+    )
+
+    strings = layer(np.array([["1.5", "2.5"], ["1.0", "nan"]]))
+    numbers = layer(np.array([[1.5, 2.5], [1.0, np.nan]], dtype=np.float32))
+
+    expected = np.array([[1.5, 2.5], [1.0, 0.0]], dtype=np.float32)
+    assert np.array_equal(strings, expected)
+    assert np.array_equal(numbers, expected)
+    assert strings.dtype == tf.float32
+
+
 def test_call_multi_with_single_column_return_right_shape():
     layer = layer_module.MultiCategoryEncoding(encoding=[layer_module.INT])
 